@@ -3,11 +3,45 @@ import json
 import os
 import time
 import shutil
-import pandas as pd
-from tqdm import tqdm
-from colorama import Fore, Style, init
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import hmac
+import secrets
+import socket
+import socketserver
+import threading
+
+# pandas, tqdm, colorama and reportlab are imported inside the functions
+# that need them so the welcome screen (and the thin daemon client) come up
+# without paying for their import time.
+
+DAEMON_HOST = '127.0.0.1'
+DAEMON_PORT = 8765
+# The daemon writes a random token here (readable by the owner only) and the
+# client sends it with every request, so other local users and web pages
+# cannot drive the daemon.
+DAEMON_TOKEN_FILE = os.path.join(os.path.expanduser('~'), '.translyzer_daemon_token')
+
+# Expected gap in days and the tolerance around it for each frequency that
+# detect_recurring() recognizes.
+RECURRING_PERIODS = {
+    'Weekly': (7, 1),
+    'Biweekly': (14, 2),
+    'Monthly': (30.4, 4),
+    'Annual': (365.25, 10),
+}
+RECURRING_MIN_OCCURRENCES = 3
+
+# Helvetica only covers Latin characters, so report lines with other scripts
+# (e.g. a merchant named 東京電力) are drawn with the first of these TrueType
+# fonts that exists. TRANSLYZER_REPORT_FONT takes precedence.
+REPORT_UNICODE_FONTS = [
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf',
+    '/Library/Fonts/Arial Unicode.ttf',
+    '/System/Library/Fonts/Supplemental/Arial Unicode.ttf',
+    'C:\\Windows\\Fonts\\arialuni.ttf',
+]
+AMOUNT_DRIFT_THRESHOLD = 0.05
 
 
 def dynamic_print(text, delay=0.02):
@@ -136,6 +170,9 @@ def upload_files():
     """
     Upload files based on user input.
     """
+    import pandas as pd
+    from tqdm import tqdm
+
     combined_data = []
     upload_prompt(combined_data)
        
@@ -227,27 +264,41 @@ def undo_redo(file_paths, combined_data):
         else:
             print("Invalid input. Please enter 'R' to redo, 'U' to undo, or 'N' to continue.")
 
+def read_bank_statement(file_path, account_name, account_type, date_col, desc_col, amount_col, category_col, is_negative_spending):
+    """
+    Read one bank statement into the combined column layout.
+
+    Raises the underlying error if the file cannot be read or a column is
+    missing; preprocess_bank_statement() reports it instead.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(file_path, index_col=False)
+    
+    df.columns = [col.capitalize() for col in df.columns]
+    
+    df = df.rename(columns={
+        date_col: 'Date',
+        desc_col: 'Description',
+        amount_col: 'Amount',
+        category_col: 'Category'
+    })
+    
+    if is_negative_spending == 'n':
+        df['Amount'] = df['Amount'] * -1
+    
+    df['Account Name'] = account_name
+    df['Account Type'] = account_type
+    
+    df = df[['Account Name', 'Account Type', 'Date', 'Description', 'Amount', 'Category']]
+    return df
+
+
 def preprocess_bank_statement(file_path, account_name, account_type, date_col, desc_col, amount_col, category_col, is_negative_spending):
+    import pandas as pd
+
     try:
-        df = pd.read_csv(file_path, index_col=False)
-        
-        df.columns = [col.capitalize() for col in df.columns]
-        
-        df = df.rename(columns={
-            date_col: 'Date',
-            desc_col: 'Description',
-            amount_col: 'Amount',
-            category_col: 'Category'
-        })
-        
-        if is_negative_spending == 'n':
-            df['Amount'] = df['Amount'] * -1
-        
-        df['Account Name'] = account_name
-        df['Account Type'] = account_type
-        
-        df = df[['Account Name', 'Account Type', 'Date', 'Description', 'Amount', 'Category']]
-        return df
+        return read_bank_statement(file_path, account_name, account_type, date_col, desc_col, amount_col, category_col, is_negative_spending)
 
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
@@ -308,11 +359,16 @@ def display_income(df):
   | {income}                                       |
   --------------------------------------------------
 
+  Recurring Income:
+        """
+    print(summary)
+    recurring = detect_recurring(df)
+    print_recurring(recurring[recurring['Typical Amount'] > 0])
+    print("""
   [Press B to Go Back to Main Menu]
   [Press Ctrl + C to Exit the Program at any time]
 =========================================================================
-        """
-    print(summary)
+        """)
     while True:
         choice = input().upper()
         if choice == 'B':
@@ -389,6 +445,8 @@ def read_response_from_file(file_path):
 
 def process_response(df, file_path):
     """Processes the response and updates the DataFrame."""
+    import pandas as pd
+
     while True:
         try:
             response = read_response_from_file(file_path)
@@ -512,6 +570,9 @@ def display_expense(df):
     lowest_expense = request_to_microserviceA(2)
     time.sleep(2)
     average_expense = request_to_microserviceA(3)
+    recurring = detect_recurring(df)
+    recurring = recurring[recurring['Typical Amount'] < 0]
+    recurring_count = len(recurring)
     
     def display_expense_summary():
         summary = f"""
@@ -541,6 +602,8 @@ def display_expense(df):
   [+] Detailed Expense by Category:                                    
   (Press D to show/hide details)                                       
                                                                        
+  [+] Recurring Payments: {recurring_count} found                      
+  (Press R to show recurring payments)                                 
                                                                        
   [Press B to Go Back to Main Menu]                                    
   [Press Ctrl + C to Exit the Program at any time]                            
@@ -569,70 +632,345 @@ def display_expense(df):
   | Category                    | Amount             |                 
   |-----------------------------|--------------------|                        
               """)
-        grouped = df[df['Amount'] < 0].groupby('Category')['Amount'].sum().abs().reset_index()
-        for _, row in grouped.iterrows():
-            print(f"  | {row['Category']:<30} | ${row['Amount']:<9.2f}  |")
+        _, expenses_by_category = summarize_expenses(df)
+        for category, amount in expenses_by_category.items():
+            print(f"  | {category:<30} | ${-amount:<9.2f}  |")
         print("|  --------------------------------------------------------------------|")
         print("""                                                                       
   [Press B to Go Back to Main Menu]                                    
   [Press Ctrl + C to Exit the Program at any time]                            
 ========================================================================= """)
     
+    def display_recurring_expense():
+        print("""
+=========================================================================
+  Recurring Payments (subscriptions, rent, bills)
+""")
+        print_recurring(recurring)
+        print("""
+  (Press R to hide recurring payments)
+
+  [Press B to Go Back to Main Menu]
+  [Press Ctrl + C to Exit the Program at any time]
+=========================================================================""")
+    
     display_expense_summary()
     detailed_view = False
+    recurring_view = False
     
     while True:
         choice = input().upper()
         if choice == 'D':
             detailed_view = not detailed_view
+            recurring_view = False
             if detailed_view:
                 display_detailed_expense()
             else:
                 display_expense_summary()
+        
+        elif choice == 'R':
+            recurring_view = not recurring_view
+            detailed_view = False
+            if recurring_view:
+                display_recurring_expense()
+            else:
+                display_expense_summary()
             
         elif choice == 'B':
             display_menu(df)
             break
         else:
-            print("Invalid input. Please press D, B, or X.")
+            print("Invalid input. Please press D, R, or B.")
 
 
-def generate_report(df):
+def summarize_expenses(df):
     """
-    Generates a report from the combined transactions DataFrame.
+    Calculate the total expense and the expenses per category.
 
     Args:
         df (pd.DataFrame): DataFrame containing the combined bank statements.
 
     Returns:
-        None
+        tuple: The total expense and a Series of expenses by category.
+            Expenses are negative values.
     """
+    import pandas as pd
+
     # Ensure the Amount column is numeric
     df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
-    
-    # Total expenses (assuming expenses are negative values)
-    total_expenses = df[df['Amount'] < 0]['Amount'].sum()
-    
-    # Expenses by category
-    expenses_by_category = df[df['Amount'] < 0].groupby('Category')['Amount'].sum()
-    
-    # Prepare report content
-    report_content = [
-        "Bank Statement Analysis Report",
-        "==============================",
-        f"Total Expenses: ${-total_expenses:.2f}",  # Display expenses as positive values
-        "",
-        "Expenses by Category:",
-        "----------------------",
-    ]
-    
-    for category, amount in expenses_by_category.items():
-        report_content.append(f"{category}: ${-amount:.2f}")  # Display expenses as positive values
+    expenses = df[df['Amount'] < 0]
+    total_expenses = expenses['Amount'].sum()
+    expenses_by_category = expenses.groupby('Category')['Amount'].sum()
+    return total_expenses, expenses_by_category
+
+
+def normalize_merchant(descriptions):
+    """
+    Reduce transaction descriptions to a merchant key so that charges like
+    'NETFLIX.COM 8472' and 'Netflix.com 9931' are grouped together.
+
+    Args:
+        descriptions (pd.Series): The Description column.
+
+    Returns:
+        pd.Series: Lowercase descriptions with digits, punctuation and
+            underscores removed; letters in any script are kept.
+    """
+    return (descriptions.astype(str)
+            .str.lower()
+            .str.replace(r'[\W\d_]+', ' ', regex=True)
+            .str.strip())
+
+
+def parse_dates(df):
+    """
+    Parse the Date column of the combined statements.
+
+    Banks use different date formats, so each account's dates are parsed
+    separately with the format pandas infers for that statement. Rows that
+    still fail, e.g. a statement mixing formats, are retried one by one.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the combined bank statements.
+
+    Returns:
+        pd.Series: The parsed dates, NaT where a date could not be read.
+    """
+    import pandas as pd
+
+    dates = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    for _, rows in df.groupby(account_names(df), sort=False).groups.items():
+        dates[rows] = pd.to_datetime(df.loc[rows, 'Date'], errors='coerce')
+    retry = dates.isna() & df['Date'].notna()
+    if retry.any():
+        dates[retry] = pd.to_datetime(df.loc[retry, 'Date'], format='mixed', errors='coerce')
+    return dates
+
+
+def account_names(df):
+    """Return the Account Name column, or one unnamed account if it is missing."""
+    import pandas as pd
+
+    if 'Account Name' in df:
+        return df['Account Name'].fillna('').astype(str)
+    return pd.Series('', index=df.index)
+
+
+def detect_recurring(df):
+    """
+    Find recurring charges and deposits (subscriptions, rent, payroll).
+
+    Transactions are grouped by normalized merchant and the gaps between
+    consecutive dates are compared against RECURRING_PERIODS. All steps are
+    column operations over the whole DataFrame, so apart from a single sort
+    the cost grows linearly with the number of transactions.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the combined bank statements.
+
+    Returns:
+        pd.DataFrame: One row per recurring merchant with the columns
+            'Frequency', 'Count', 'Last Date', 'Typical Amount',
+            'Last Amount', 'Amount Drift' and 'Missed Payments'.
+            Amounts keep their sign: expenses are negative. The IDs of
+            transactions skipped because their date or amount could not be
+            read are listed in the 'Unparsed Rows' entry of its attrs.
+    """
+    import numpy as np
+    import pandas as pd
+
+    columns = ['Frequency', 'Count', 'Last Date', 'Typical Amount',
+               'Last Amount', 'Amount Drift', 'Missed Payments']
+
+    data = pd.DataFrame({
+        'Merchant': normalize_merchant(df['Description']),
+        'Account': account_names(df),
+        'Date': parse_dates(df),
+        'Amount': pd.to_numeric(df['Amount'], errors='coerce'),
+    })
+    unparsed = data['Date'].isna() | data['Amount'].isna()
+    unparsed_rows = data.index[unparsed].tolist()
+    data = data[~unparsed & (data['Merchant'] != '')]
+
+    def finish(result):
+        result.attrs['Unparsed Rows'] = unparsed_rows
+        return result
+
+    if data.empty:
+        return finish(pd.DataFrame(columns=columns))
+
+    data = data.sort_values(['Merchant', 'Date'], kind='mergesort')
+    # A payment is only overdue if its statement runs past the due date, so
+    # each transaction is measured against the end of its own account.
+    data['Statement End'] = data.groupby('Account')['Date'].transform('max')
+    data['Gap'] = data.groupby('Merchant', sort=False)['Date'].diff().dt.days
+    # A second charge on the same day (a duplicate or split payment) says
+    # nothing about the period, so keep it out of the median and regularity.
+    data['Gap'] = data['Gap'].where(data['Gap'] != 0)
+
+    stats = data.groupby('Merchant', sort=False).agg(
+        Count=('Date', 'size'),
+        Payment_Days=('Date', 'nunique'),
+        Last_Date=('Date', 'last'),
+        Statement_End=('Statement End', 'max'),
+        Median_Gap=('Gap', 'median'),
+        Typical_Amount=('Amount', 'median'),
+        Last_Amount=('Amount', 'last'),
+    )
+    stats = stats[(stats['Payment_Days'] >= RECURRING_MIN_OCCURRENCES) & (stats['Typical_Amount'] != 0)]
+
+    # Match each merchant's median gap to the nearest known frequency.
+    stats['Frequency'] = None
+    stats['Period'] = np.nan
+    stats['Tolerance'] = np.nan
+    for frequency, (days, tolerance) in RECURRING_PERIODS.items():
+        match = (stats['Median_Gap'] - days).abs() <= tolerance
+        stats.loc[match, ['Frequency', 'Period', 'Tolerance']] = [frequency, days, tolerance]
+    stats = stats.dropna(subset=['Period'])
+    if stats.empty:
+        return finish(pd.DataFrame(columns=columns))
+
+    # Compare every gap with its merchant's period. A gap of roughly k
+    # periods means k - 1 payments were missed in between.
+    gaps = data[data['Merchant'].isin(stats.index)].dropna(subset=['Gap'])
+    period = gaps['Merchant'].map(stats['Period'])
+    tolerance = gaps['Merchant'].map(stats['Tolerance'])
+    periods_elapsed = (gaps['Gap'] / period).round()
+    on_schedule = (gaps['Gap'] - periods_elapsed * period).abs() <= tolerance * periods_elapsed.clip(lower=1)
+    missed = (periods_elapsed - 1).clip(lower=0).where(on_schedule, 0)
+    gap_stats = pd.DataFrame({
+        'Merchant': gaps['Merchant'],
+        'On Schedule': on_schedule,
+        'Missed': missed,
+    }).groupby('Merchant').agg(Regularity=('On Schedule', 'mean'), Missed=('Missed', 'sum'))
+    stats = stats.join(gap_stats)
+    stats = stats[stats['Regularity'] >= 0.5]
+
+    # Payments that should have arrived after the last one but did not.
+    overdue = ((stats['Statement_End'] - stats['Last_Date']).dt.days - stats['Tolerance']) // stats['Period']
+    stats['Missed'] += overdue.clip(lower=0)
+
+    # Positive drift means the latest charge or deposit is larger than usual.
+    drift = (stats['Last_Amount'].abs() - stats['Typical_Amount'].abs()) / stats['Typical_Amount'].abs()
+    stats['Amount Drift'] = drift.where(drift.abs() > AMOUNT_DRIFT_THRESHOLD, 0.0)
+
+    result = stats.rename(columns={
+        'Last_Date': 'Last Date',
+        'Typical_Amount': 'Typical Amount',
+        'Last_Amount': 'Last Amount',
+        'Missed': 'Missed Payments',
+    })[columns]
+    result['Missed Payments'] = result['Missed Payments'].astype(int)
+    result.index.name = 'Merchant'
+    return finish(result.sort_values('Typical Amount'))
+
+
+def format_recurring(recurring):
+    """
+    Describe each recurring payment in one line of text.
+
+    Args:
+        recurring (pd.DataFrame): The result of detect_recurring().
+
+    Returns:
+        list: One string per recurring merchant.
+    """
+    lines = []
+    for merchant, row in recurring.iterrows():
+        line = f"{merchant}: ${abs(row['Typical Amount']):.2f} {row['Frequency'].lower()}"
+        if row['Amount Drift']:
+            line += f", last ${abs(row['Last Amount']):.2f} ({row['Amount Drift']:+.0%})"
+        if row['Missed Payments']:
+            line += f", {row['Missed Payments']} missed"
+        lines.append(line)
+    return lines
+
+
+def format_unparsed(recurring):
+    """
+    Describe the transactions detect_recurring() could not read.
+
+    Args:
+        recurring (pd.DataFrame): The result of detect_recurring().
+
+    Returns:
+        string: A one-line note, or None if every transaction was read.
+    """
+    rows = recurring.attrs.get('Unparsed Rows', [])
+    if not rows:
+        return None
+    shown = ', '.join(str(row) for row in rows[:10])
+    more = f" and {len(rows) - 10} more" if len(rows) > 10 else ""
+    return f"{len(rows)} transactions with an unreadable date or amount were skipped (IDs {shown}{more})."
+
+
+def print_recurring(recurring):
+    """Print the recurring payments found by detect_recurring()."""
+    lines = format_recurring(recurring)
+    if not lines:
+        print("  No recurring payments found.")
+    for line in lines:
+        print(f"  - {line}")
+    note = format_unparsed(recurring)
+    if note:
+        print(f"  ⚠️ {note}")
+
+
+def report_unicode_font():
+    """
+    Register a TrueType font for text that Helvetica cannot draw.
+
+    Returns:
+        string: The registered font name, or None if no font was found, in
+            which case non-Latin characters are unreadable in the report.
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    if 'TranslyzerUnicode' in pdfmetrics.getRegisteredFontNames():
+        return 'TranslyzerUnicode'
+    paths = [os.environ.get('TRANSLYZER_REPORT_FONT')] + REPORT_UNICODE_FONTS
+    for path in paths:
+        if path and os.path.exists(path):
+            pdfmetrics.registerFont(TTFont('TranslyzerUnicode', path))
+            return 'TranslyzerUnicode'
+    return None
+
+
+def write_report(df, file_path='report.pdf'):
+    """
+    Write the analysis report PDF for the combined transactions DataFrame.
+
+    Lines with characters outside Helvetica's Latin set use the font from
+    report_unicode_font(); without one they are not readable.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the combined bank statements.
+        file_path (string, optional): Where to save the PDF.
+            Defaults to 'report.pdf'.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    total_expenses, expenses_by_category = summarize_expenses(df)
 
     # Create PDF
-    c = canvas.Canvas("report.pdf", pagesize=letter)
+    c = canvas.Canvas(file_path, pagesize=letter)
     width, height = letter
     
+    def draw_text(y, text):
+        """Draw one line, switching to the Unicode font if Helvetica lacks a glyph."""
+        try:
+            text.encode('cp1252')
+        except UnicodeEncodeError:
+            font = report_unicode_font()
+            if font:
+                c.setFont(font, 12)
+                c.drawString(30, y, text)
+                c.setFont("Helvetica", 12)
+                return
+        c.drawString(30, y, text)
+    
     # Title
     c.setFont("Helvetica-Bold", 16)
     c.drawString(30, height - 50, "Bank Statement Analysis Report")
@@ -648,23 +986,320 @@ def generate_report(df):
     
     y = height - 170
     for category, amount in expenses_by_category.items():
-        c.drawString(30, y, f"{category}: ${-amount:.2f}")  # Display expenses as positive values
+        draw_text(y, f"{category}: ${-amount:.2f}")  # Display expenses as positive values
+        y -= 20
+    
+    # Recurring Expenses and Recurring Income, split by sign like the
+    # summary screens, since the lines show amounts without a sign.
+    recurring = detect_recurring(df)
+    sections = [
+        ("Recurring Expenses:", recurring[recurring['Typical Amount'] < 0], "No recurring expenses found."),
+        ("Recurring Income:", recurring[recurring['Typical Amount'] > 0], "No recurring income found."),
+    ]
+    for title, rows, empty in sections:
         y -= 20
+        # Keep the header, its rule and the first line together on one page.
+        if y - 40 < 50:
+            c.showPage()
+            c.setFont("Helvetica", 12)
+            y = height - 50
+        c.drawString(30, y, title)
+        c.drawString(30, y - 20, "----------------------")
+        y -= 40
+        for line in format_recurring(rows) or [empty]:
+            if y < 50:
+                c.showPage()
+                c.setFont("Helvetica", 12)
+                y = height - 50
+            draw_text(y, line)
+            y -= 20
+    
+    note = format_unparsed(recurring)
+    if note:
+        y -= 20
+        if y < 50:
+            c.showPage()
+            c.setFont("Helvetica", 12)
+            y = height - 50
+        c.drawString(30, y, note)
     
     # Save PDF
     c.save()
+
+
+def generate_report(df):
+    """
+    Generates a report from the combined transactions DataFrame.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the combined bank statements.
+
+    Returns:
+        None
+    """
+    write_report(df, 'report.pdf')
     print("Report is saved to report.pdf")
     display_menu(df)
 
-# Example usage:
-# Assuming transactions_df is your DataFrame containing the combined bank statements
-# transactions_df = pd.DataFrame(...)  # Load or create your DataFrame here
-# generate_report(transactions_df, 'bank_statement_report.txt')
 
-    pass
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    Answer one JSON request per line from the thin client.
+
+    The loaded DataFrame and its expense aggregates live on the server, so
+    repeat queries skip the imports and the CSV preprocessing.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                # Not our protocol (e.g. an HTTP request from a browser).
+                self.reply({'Type': 'Error', 'Message': 'Invalid request'})
+                return
+            if not isinstance(request, dict) or not self.server.check_token(request.get('Token')):
+                self.reply({'Type': 'Error', 'Message': 'Invalid token'})
+                return
+            try:
+                # Requests may arrive on several threads; serialize them so a
+                # summary of old data is never cached after a new load.
+                with self.server.lock:
+                    response = {'Type': 'Response', 'Data': self.server.dispatch(request)}
+            except Exception as e:
+                response = {'Type': 'Error', 'Message': str(e)}
+            self.reply(response)
+            if response['Type'] == 'Response' and request.get('Command') == 'shutdown':
+                # shutdown() blocks until serve_forever() returns, so it
+                # cannot run on the request thread. Reply first, then stop.
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+    def reply(self, response):
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+        self.wfile.flush()
+
+
+class TranslyzerDaemon(socketserver.ThreadingTCPServer):
+    """Long-lived server that keeps the combined statements warm."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, DaemonHandler)
+        # Importing pandas here moves its cost to daemon start-up.
+        import pandas as pd
+        self.df = pd.DataFrame(columns=['Account Name', 'Account Type', 'Date', 'Description', 'Amount', 'Category'])
+        self.lock = threading.Lock()
+        self.token = secrets.token_hex(32)
+        # Reports may only be written below the directory the daemon runs in.
+        self.root = os.path.realpath(os.getcwd())
+        self.expense_summary = None
+        self.recurring_summary = None
+
+    def check_token(self, token):
+        """Compare a request's token with ours in constant time."""
+        if not isinstance(token, str):
+            return False
+        return hmac.compare_digest(token.encode('utf-8'), self.token.encode('utf-8'))
+
+    def report_path(self, file_path):
+        """
+        Resolve where a 'report' request may write its PDF.
+
+        Raises ValueError for paths outside the daemon's working directory,
+        names that do not end in .pdf, and existing files that are not PDFs.
+        """
+        path = os.path.realpath(os.path.join(self.root, file_path))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"Reports can only be written inside {self.root}")
+        if not path.lower().endswith('.pdf'):
+            raise ValueError("Report path must end in .pdf")
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                if file.read(5) != b'%PDF-':
+                    raise ValueError(f"Refusing to overwrite {path}: it is not a PDF")
+        return path
+
+    def dispatch(self, request):
+        command = request.get('Command')
+        if command == 'ping':
+            return 'pong'
+        elif command == 'load':
+            return self.load(request.get('Files', []))
+        elif command == 'transactions':
+            # json.dumps would send NaN, which only Python can read back.
+            return self.df.astype(object).where(self.df.notna(), None).to_dict()
+        elif command == 'expense':
+            return self.expense()
+        elif command == 'recurring':
+            return self.recurring()
+        elif command == 'report':
+            file_path = self.report_path(request.get('Path', 'report.pdf'))
+            write_report(self.df, file_path)
+            return file_path
+        elif command == 'shutdown':
+            return 'Shutting down'
+        raise ValueError(f"Unknown command: {command}")
+
+    def load(self, files):
+        """
+        Preprocess and combine the given bank statements, replacing the
+        currently loaded data.
+
+        Args:
+            files (list): One dict per file with the keys 'path',
+                'account_name', 'account_type', 'date_col', 'desc_col',
+                'amount_col', 'category_col' and 'is_negative_spending'.
+
+        Returns:
+            dict: The number of loaded rows and, for every file that was
+                skipped, its path and the reason.
+        """
+        import pandas as pd
+
+        combined_data = []
+        skipped = []
+        for spec in files:
+            try:
+                df = read_bank_statement(
+                    spec['path'],
+                    spec.get('account_name', '').strip().capitalize(),
+                    spec.get('account_type', '').strip().capitalize(),
+                    spec['date_col'].strip().capitalize(),
+                    spec['desc_col'].strip().capitalize(),
+                    spec['amount_col'].strip().capitalize(),
+                    spec['category_col'].strip().capitalize(),
+                    spec.get('is_negative_spending', 'y').strip().lower())
+            except Exception as e:
+                skipped.append({'Path': spec.get('path'), 'Error': f"{type(e).__name__}: {e}"})
+                continue
+            if df.empty:
+                skipped.append({'Path': spec['path'], 'Error': "No transactions found"})
+            else:
+                combined_data.append(df)
+        if not combined_data:
+            reasons = '; '.join(f"{s['Path']}: {s['Error']}" for s in skipped)
+            raise ValueError(f"No bank statements could be loaded. {reasons}".strip())
+        self.df = pd.concat(combined_data, ignore_index=True)
+        self.df.index.name = 'ID'
+        self.expense_summary = None
+        self.recurring_summary = None
+        return {'Rows': len(self.df), 'Skipped': skipped}
+
+    def expense(self):
+        """Return the expense summary, computing it only after a new load."""
+        if self.expense_summary is None:
+            total_expenses, expenses_by_category = summarize_expenses(self.df)
+            self.expense_summary = {
+                'Total Expense': float(-total_expenses),
+                'By Category': {str(category): float(-amount) for category, amount in expenses_by_category.items()},
+            }
+        return self.expense_summary
+
+    def recurring(self):
+        """Return the recurring payments, detecting them only after a new load."""
+        if self.recurring_summary is None:
+            recurring = detect_recurring(self.df)
+            unparsed_rows = recurring.attrs['Unparsed Rows']
+            recurring['Last Date'] = recurring['Last Date'].astype(str)
+            self.recurring_summary = {
+                'Recurring': recurring.to_dict(orient='index'),
+                'Unparsed Rows': unparsed_rows,
+            }
+        return self.recurring_summary
+
+
+def token_file():
+    """Return where the daemon's token is kept (TRANSLYZER_TOKEN_FILE overrides it)."""
+    return os.environ.get('TRANSLYZER_TOKEN_FILE', DAEMON_TOKEN_FILE)
+
+
+def run_daemon(port=DAEMON_PORT):
+    """Serve requests on localhost until a 'shutdown' command arrives."""
+    with TranslyzerDaemon((DAEMON_HOST, port)) as server:
+        path = token_file()
+        # Remove a stale file so it is recreated with owner-only permissions.
+        if os.path.exists(path):
+            os.remove(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            file.write(server.token)
+        try:
+            print(f"Translyzer daemon listening on {DAEMON_HOST}:{port}")
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
+
+def send_command(request, port=DAEMON_PORT, token=None):
+    """
+    Send one request to the daemon and return its response.
+
+    The token is read from token_file() unless given. Only the standard
+    library is used here so the client starts instantly.
+    """
+    if token is None:
+        with open(token_file(), 'r') as file:
+            token = file.read().strip()
+    request = dict(request, Token=token)
+    with socket.create_connection((DAEMON_HOST, port)) as conn:
+        conn.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with conn.makefile('r', encoding='utf-8') as reader:
+            return json.loads(reader.readline())
+
+
+def run_client(args, port=DAEMON_PORT):
+    """
+    Build a request from the command line arguments and print the response.
+
+    Usage:
+        python main.py --client ping
+        python main.py --client load '<JSON list of file specs>'
+        python main.py --client expense
+        python main.py --client recurring
+        python main.py --client report [path]
+        python main.py --client shutdown
+    """
+    if not args:
+        print(run_client.__doc__)
+        return 1
+    request = {'Type': 'Request', 'Command': args[0]}
+    if args[0] == 'load':
+        if len(args) < 2:
+            print(run_client.__doc__)
+            return 1
+        try:
+            request['Files'] = json.loads(args[1])
+        except json.JSONDecodeError as e:
+            print(f"Error: the file specs are not valid JSON ({e}).")
+            return 1
+    elif args[0] == 'report' and len(args) > 1:
+        request['Path'] = args[1]
+    try:
+        response = send_command(request, port)
+    except (ConnectionRefusedError, FileNotFoundError):
+        print(f"No Translyzer daemon is running on port {port}. Start one with 'python main.py --daemon'.")
+        return 1
+    if response['Type'] == 'Error':
+        print(f"Error: {response['Message']}")
+        return 1
+    print(json.dumps(response['Data'], indent=2))
+    if args[0] == 'load' and response['Data']['Skipped']:
+        return 1
+    return 0
 
 
 def main():
+    port = int(os.environ.get('TRANSLYZER_PORT', DAEMON_PORT))
+    if sys.argv[1:2] == ['--daemon']:
+        run_daemon(port)
+        return
+    if sys.argv[1:2] == ['--client']:
+        sys.exit(run_client(sys.argv[2:], port))
+
+    from colorama import init
     init()
     try:
         # Ensure the console uses UTF-8 encoding
@@ -0,0 +1,136 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import main
+from main import TranslyzerDaemon, run_client, send_command
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """Run a daemon on a free port in tmp_path and stop it afterwards."""
+    monkeypatch.chdir(tmp_path)
+    server = TranslyzerDaemon(('127.0.0.1', 0))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    server.thread = thread
+    server.port = server.server_address[1]
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+    server.server_close()
+
+
+def call(server, command, **fields):
+    request = dict({'Type': 'Request', 'Command': command}, **fields)
+    return send_command(request, server.port, token=server.token)
+
+
+def write_statement(path, rows):
+    path.write_text('Date,Description,Amount,Category\n' + ''.join(f'{row}\n' for row in rows))
+    return {'path': str(path), 'date_col': 'Date', 'desc_col': 'Description',
+            'amount_col': 'Amount', 'category_col': 'Category'}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_daemon_commands(daemon, tmp_path):
+    assert call(daemon, 'ping') == {'Type': 'Response', 'Data': 'pong'}
+
+    spotify = write_statement(tmp_path / 'spotify.csv', [
+        f'2024-{month:02d}-03,SPOTIFY,-9.99,Music' for month in range(1, 5)
+    ])
+    missing = dict(spotify, path=str(tmp_path / 'missing.csv'))
+    response = call(daemon, 'load', Files=[spotify, missing])
+    assert response['Data']['Rows'] == 4
+    assert [skipped['Path'] for skipped in response['Data']['Skipped']] == [missing['path']]
+    assert 'FileNotFoundError' in response['Data']['Skipped'][0]['Error']
+
+    expense = call(daemon, 'expense')['Data']
+    assert expense['Total Expense'] == pytest.approx(39.96)
+    assert list(call(daemon, 'recurring')['Data']['Recurring']) == ['spotify']
+
+    # A new load must not serve the summaries cached for the old data.
+    rent = write_statement(tmp_path / 'rent.csv', [
+        f'2024-{month:02d}-01,RENT,-1500,Housing' for month in range(1, 5)
+    ])
+    assert call(daemon, 'load', Files=[rent])['Data'] == {'Rows': 4, 'Skipped': []}
+    assert call(daemon, 'expense')['Data']['By Category'] == {'Housing': 6000.0}
+    assert list(call(daemon, 'recurring')['Data']['Recurring']) == ['rent']
+
+    response = call(daemon, 'frobnicate')
+    assert response == {'Type': 'Error', 'Message': 'Unknown command: frobnicate'}
+
+
+def test_transactions_are_valid_json(daemon, tmp_path):
+    statement = write_statement(tmp_path / 'gaps.csv', ['2024-01-03,SPOTIFY,,'])
+    call(daemon, 'load', Files=[statement])
+    data = call(daemon, 'transactions')['Data']
+    json.dumps(data, allow_nan=False)
+    assert data['Amount'] == {'0': None}
+
+
+def test_report_paths(daemon, tmp_path):
+    assert call(daemon, 'report', Path='out.pdf')['Data'] == str(tmp_path / 'out.pdf')
+    assert (tmp_path / 'out.pdf').read_bytes().startswith(b'%PDF-')
+    assert call(daemon, 'report', Path='out.pdf')['Type'] == 'Response'
+
+    (tmp_path / 'notes.pdf').write_text('keep me')
+    for path in ['../outside.pdf', str(tmp_path.parent / 'outside.pdf'), 'report.txt', 'notes.pdf']:
+        assert call(daemon, 'report', Path=path)['Type'] == 'Error'
+    assert not (tmp_path.parent / 'outside.pdf').exists()
+    assert (tmp_path / 'notes.pdf').read_text() == 'keep me'
+
+
+def test_rejects_requests_without_token(daemon):
+    with socket.create_connection(('127.0.0.1', daemon.port)) as conn:
+        conn.sendall(b'{"Command": "ping", "Token": "wrong"}\n{"Command": "ping"}\n')
+        reader = conn.makefile('r')
+        assert json.loads(reader.readline())['Message'] == 'Invalid token'
+        assert reader.readline() == ''
+
+
+def test_drops_connection_on_invalid_json(daemon):
+    body = json.dumps({'Command': 'shutdown', 'Token': daemon.token})
+    with socket.create_connection(('127.0.0.1', daemon.port)) as conn:
+        conn.sendall(f'POST / HTTP/1.1\r\nOrigin: http://example.com\r\n\r\n{body}\n'.encode())
+        reader = conn.makefile('r')
+        assert json.loads(reader.readline())['Message'] == 'Invalid request'
+        assert reader.readline() == ''
+    assert call(daemon, 'ping')['Data'] == 'pong'
+
+
+def test_shutdown_replies_then_stops(daemon):
+    assert call(daemon, 'shutdown') == {'Type': 'Response', 'Data': 'Shutting down'}
+    daemon.thread.join(timeout=5)
+    assert not daemon.thread.is_alive()
+
+
+def test_run_client_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('TRANSLYZER_TOKEN_FILE', str(tmp_path / 'token'))
+    assert run_client(['load']) == 1
+    assert run_client(['load', '[{bad']) == 1
+    assert 'not valid JSON' in capsys.readouterr().out
+
+    # No daemon: neither a token file nor a listening port.
+    assert run_client(['ping'], port=free_port()) == 1
+    (tmp_path / 'token').write_text('stale')
+    assert run_client(['ping'], port=free_port()) == 1
+    assert 'No Translyzer daemon is running' in capsys.readouterr().out
+
+
+def test_import_is_lazy():
+    code = ('import sys, main; '
+            'print([m for m in ("pandas", "reportlab", "tqdm", "colorama") if m in sys.modules])')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(main.__file__)))
+    assert result.stdout.strip() == '[]'
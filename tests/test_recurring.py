@@ -0,0 +1,206 @@
+import os
+
+import pandas as pd
+import pytest
+
+from main import detect_recurring, format_recurring, format_unparsed, normalize_merchant, write_report
+
+
+def statement(account, dates, description, amount, date_format='%Y-%m-%d'):
+    """Build a preprocessed statement with one transaction per date."""
+    dates = pd.to_datetime(pd.Series(dates))
+    amounts = amount if isinstance(amount, list) else [amount] * len(dates)
+    return pd.DataFrame({
+        'Account Name': account,
+        'Account Type': 'Debit',
+        'Date': dates.dt.strftime(date_format),
+        'Description': description,
+        'Amount': amounts,
+        'Category': 'Bills',
+    })
+
+
+def combine(*statements):
+    df = pd.concat(statements, ignore_index=True)
+    df.index.name = 'ID'
+    return df
+
+
+def monthly(start, count):
+    return [pd.Timestamp(start) + pd.DateOffset(months=i) for i in range(count)]
+
+
+def every(start, days, count):
+    return list(pd.date_range(start, periods=count, freq=f'{days}D'))
+
+
+@pytest.mark.parametrize('days, frequency', [
+    (7, 'Weekly'),
+    (14, 'Biweekly'),
+    (30, 'Monthly'),
+    (365, 'Annual'),
+])
+def test_detects_each_frequency(days, frequency):
+    df = combine(statement('Checking', every('2020-01-01', days, 4), 'ACME', -20.0))
+    result = detect_recurring(df)
+    assert result.loc['acme', 'Frequency'] == frequency
+    assert result.loc['acme', 'Count'] == 4
+    assert result.loc['acme', 'Missed Payments'] == 0
+
+
+@pytest.mark.parametrize('days, detected', [(34, True), (35, False)])
+def test_monthly_tolerance_limit(days, detected):
+    df = combine(statement('Checking', every('2024-01-01', days, 4), 'ACME', -20.0))
+    assert ('acme' in detect_recurring(df).index) == detected
+
+
+def test_needs_three_occurrences():
+    df = combine(statement('Checking', monthly('2024-01-15', 2), 'ACME', -20.0))
+    assert detect_recurring(df).empty
+
+
+def test_same_day_duplicates_do_not_change_period():
+    dates = monthly('2024-01-15', 4)
+    df = combine(statement('Checking', dates + dates, 'GYM', -30.0))
+    result = detect_recurring(df)
+    assert result.loc['gym', 'Frequency'] == 'Monthly'
+    assert result.loc['gym', 'Count'] == 8
+    assert result.loc['gym', 'Missed Payments'] == 0
+
+
+def test_same_day_duplicates_do_not_count_as_occurrences():
+    dates = monthly('2024-01-15', 2)
+    df = combine(statement('Checking', dates + dates, 'GYM', -30.0))
+    assert detect_recurring(df).empty
+
+
+def test_groups_descriptions_by_merchant():
+    df = combine(statement('Checking', monthly('2024-01-15', 4), 'x', -15.99))
+    df['Description'] = ['NETFLIX.COM 8472', 'Netflix.com 9931', 'NETFLIX.COM #12', 'netflix.com_7']
+    assert detect_recurring(df).index.tolist() == ['netflix com']
+
+
+def test_normalize_merchant_keeps_non_ascii_letters():
+    descriptions = pd.Series(['CAFÉ 12', '東京電力 #3', 'NETFLIX.COM_88'])
+    assert normalize_merchant(descriptions).tolist() == ['café', '東京電力', 'netflix com']
+
+
+def test_counts_missed_payment_inside_series():
+    dates = monthly('2024-01-05', 6)
+    del dates[3]
+    df = combine(statement('Checking', dates, 'GYM', -30.0))
+    assert detect_recurring(df).loc['gym', 'Missed Payments'] == 1
+
+
+def test_counts_overdue_payments_until_end_of_account():
+    df = combine(
+        statement('Checking', monthly('2024-01-05', 4), 'STREAMING', -9.99),
+        statement('Checking', monthly('2024-01-20', 8), 'RENT', -1500.0),
+    )
+    result = detect_recurring(df)
+    # Due on May, June, July and August 5th; the account runs to August 20th.
+    assert result.loc['streaming', 'Missed Payments'] == 4
+    assert result.loc['rent', 'Missed Payments'] == 0
+
+
+def test_statement_ending_earlier_is_not_overdue():
+    df = combine(
+        statement('Old Checking', monthly('2023-01-01', 6), 'RENT', -1500.0),
+        statement('Credit', every('2024-01-01', 7, 20), 'GYM', -10.0),
+    )
+    result = detect_recurring(df)
+    assert result.loc['rent', 'Missed Payments'] == 0
+    assert result.loc['gym', 'Missed Payments'] == 0
+
+
+def test_mixed_date_formats_across_statements():
+    df = combine(
+        statement('Chase', monthly('2024-01-05', 6), 'NETFLIX', -15.99),
+        statement('Amex', monthly('2024-01-10', 6), 'SPOTIFY', -9.99, date_format='%m/%d/%Y'),
+    )
+    result = detect_recurring(df)
+    assert sorted(result.index) == ['netflix', 'spotify']
+    assert result.attrs['Unparsed Rows'] == []
+
+
+def test_reports_unparsed_rows():
+    df = combine(statement('Checking', monthly('2024-01-05', 4), 'NETFLIX', -15.99))
+    df['Amount'] = df['Amount'].astype(object)
+    df.loc[1, 'Amount'] = 'n/a'
+    df.loc[len(df)] = ['Checking', 'Debit', 'not a date', 'NETFLIX', -15.99, 'Bills']
+    result = detect_recurring(df)
+    assert result.attrs['Unparsed Rows'] == [1, 4]
+    assert format_unparsed(result).startswith('2 transactions')
+
+
+@pytest.mark.parametrize('last_amount, drift', [(-17.99, 0.125), (-16.29, 0.0)])
+def test_amount_drift(last_amount, drift):
+    amounts = [-15.99] * 5 + [last_amount]
+    df = combine(statement('Checking', monthly('2024-01-05', 6), 'NETFLIX', amounts))
+    result = detect_recurring(df)
+    assert result.loc['netflix', 'Amount Drift'] == pytest.approx(drift, abs=1e-3)
+    assert result.loc['netflix', 'Last Amount'] == last_amount
+
+
+def test_income_keeps_positive_sign():
+    df = combine(statement('Checking', every('2024-01-12', 14, 6), 'ACME PAYROLL', 2000.0))
+    assert detect_recurring(df).loc['acme payroll', 'Typical Amount'] == 2000.0
+
+
+def test_empty_results():
+    columns = ['Frequency', 'Count', 'Last Date', 'Typical Amount',
+               'Last Amount', 'Amount Drift', 'Missed Payments']
+    no_rows = combine(statement('Checking', [], 'ACME', -20.0))
+    irregular = combine(statement('Checking', ['2024-01-01', '2024-01-04', '2024-03-30'], 'SHOP', -50.0))
+    for df in (no_rows, irregular):
+        result = detect_recurring(df)
+        assert result.empty
+        assert result.columns.tolist() == columns
+        assert format_recurring(result) == []
+        assert format_unparsed(result) is None
+
+
+def test_format_recurring():
+    amounts = [-15.99] * 4 + [-17.99]
+    dates = monthly('2024-01-05', 6)
+    del dates[2]
+    df = combine(statement('Checking', dates, 'NETFLIX', amounts))
+    assert format_recurring(detect_recurring(df)) == [
+        'netflix: $15.99 monthly, last $17.99 (+13%), 1 missed',
+    ]
+
+
+def test_report_separates_recurring_expenses_and_income(tmp_path, monkeypatch):
+    from reportlab.pdfgen import canvas
+
+    drawn = []
+    draw_string = canvas.Canvas.drawString
+    monkeypatch.setattr(canvas.Canvas, 'drawString',
+                        lambda self, x, y, text, *args, **kwargs: (drawn.append(text), draw_string(self, x, y, text, *args, **kwargs))[1])
+    df = combine(
+        statement('Checking', monthly('2024-01-01', 4), 'RENT', -1500.0),
+        statement('Checking', every('2024-01-05', 14, 8), 'ACME PAYROLL', 2000.0),
+    )
+    write_report(df, str(tmp_path / 'report.pdf'))
+    expenses, income = drawn.index('Recurring Expenses:'), drawn.index('Recurring Income:')
+    assert drawn[expenses + 2:income] == ['rent: $1500.00 monthly']
+    assert drawn[income + 2:] == ['acme payroll: $2000.00 biweekly']
+
+
+def test_report_draws_non_latin_merchants_with_unicode_font(tmp_path, monkeypatch):
+    import reportlab
+    from reportlab.pdfgen import canvas
+
+    vera = os.path.join(os.path.dirname(reportlab.__file__), 'fonts', 'Vera.ttf')
+    monkeypatch.setenv('TRANSLYZER_REPORT_FONT', vera)
+    fonts = {}
+    draw_string = canvas.Canvas.drawString
+    monkeypatch.setattr(canvas.Canvas, 'drawString',
+                        lambda self, x, y, text, *args, **kwargs: (fonts.setdefault(text, self._fontname), draw_string(self, x, y, text, *args, **kwargs))[1])
+    df = combine(
+        statement('Checking', monthly('2024-01-01', 4), 'ΩMEGA', -20.0),
+        statement('Checking', monthly('2024-01-03', 4), 'CAFÉ', -5.0),
+    )
+    write_report(df, str(tmp_path / 'report.pdf'))
+    assert fonts['ωmega: $20.00 monthly'] == 'TranslyzerUnicode'
+    assert fonts['café: $5.00 monthly'] == 'Helvetica'